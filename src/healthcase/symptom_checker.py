@@ -1,52 +1,207 @@
+import asyncio
+import dbm
+import hashlib
+import heapq
+import json
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
-
-load_dotenv()
+import pickle
+import shelve
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
 
 # testing the api key access
 # api_key = os.getenv("KEY")
 # print(api_key)
 
 
+_SYMPTOM_QUESTIONS = (
+    ("fever", "Do you have fever? (y/n): "),
+    ("fatigue", "Do you have fatigue? (y/n): "),
+    ("cough", "Do you have cough? (y/n): "),
+    ("headache", "Do you have headache? (y/n): "),
+    ("body_pain", "Do you have body pain? (y/n): "),
+    ("nausea", "Do you have nausea? (y/n): "),
+    ("vomiting", "Do you have vomiting? (y/n): "),
+    ("diarrhea", "Do you have diarrhea? (y/n): "),
+    ("rash", "Do you have rash? (y/n): "),
+    ("sore_throat", "Do you have sore throat? (y/n): "),
+    ("shortness_of_breath", "Do you have shortness of breath? (y/n): "),
+    ("chest_pain", "Do you have chest pain? (y/n): "),
+    ("confusion", "Do you have confusion? (y/n): "),
+    ("recent_travel", "Recent travel or mosquito bites? (y/n): "),
+    ("medication", "Any medication taken recently? (y/n): "),
+    ("appetite_change", "Appetite changes? (y/n): "),
+    ("urine_change", "Urine changes? (y/n): "),
+    ("weight_loss", "Weight loss? (y/n): "),
+    ("night_sweats", "Night sweats? (y/n): "),
+    ("exposure", "Recent exposure to someone sick? (y/n): "),
+)
+
+# One prompt listing every symptom, for answering them all on a single line
+_SYMPTOM_BATCH_PROMPT = (
+    "Answer y/n for each symptom, separated by spaces or commas, in this order:\n"
+    + " ".join(symptom for symptom, _ in _SYMPTOM_QUESTIONS)
+    + "\n> "
+)
+
+_TEST_QUESTIONS = (
+    ("WBC", "Enter WBC count: "),
+    ("Platelets", "Enter Platelet count: "),
+    ("Hemoglobin", "Enter Hemoglobin level: "),
+    ("Blood_Sugar", "Enter Blood Sugar level: "),
+    ("ALT", "Enter ALT (Liver) level: "),
+    ("Creatinine", "Enter Creatinine (Kidney) level: "),
+    ("Malaria", "Malaria test result (positive/negative): "),
+    ("Dengue", "Dengue test result (positive/negative): "),
+    ("Typhoid", "Typhoid test result (positive/negative): "),
+)
+
+_BOOLEAN_TESTS = ("Malaria", "Dengue", "Typhoid")
+
+
+def _parse_result(value):
+    """Parse a positive/negative test answer."""
+    return value.lower() == "positive"
+
+
+# Parser for each test answer; numeric parsers raise ValueError on bad input
+_TEST_PARSERS = {
+    test: _parse_result if test in _BOOLEAN_TESTS else float
+    for test, _ in _TEST_QUESTIONS
+}
+
+# Emergency rules as (predicate, reason); each predicate receives the bound
+# symptoms.get and basic_info.get so lookups resolve once per check
+_EMERGENCY_RULES = (
+    (lambda sg, bi: (bi("temperature") or 0) > 40, "High fever (>40°C)"),
+    (lambda sg, bi: sg("confusion") and sg("fever"), "Fever with confusion"),
+    (
+        lambda sg, bi: sg("shortness_of_breath") and sg("chest_pain"),
+        "Shortness of breath with chest pain",
+    ),
+)
+
+# Mock analysis rules as (disease, confidence, reasoning, required symptoms,
+# test-result check); a rule matches when every symptom is present and the
+# check passes
+_MOCK_RULES = (
+    (
+        "Dengue", 75, "High fever, rash, low platelets, positive dengue test",
+        ("fever", "rash", "recent_travel"),
+        lambda tr: tr.get("Dengue") and tr.get("Platelets", 200000) < 100000,
+    ),
+    (
+        "Viral Fever", 60, "Common flu-like symptoms with normal test results",
+        ("fever", "fatigue", "headache"),
+        lambda tr: not tr.get("Dengue") and not tr.get("Malaria"),
+    ),
+    (
+        "Malaria", 70, "Fever with travel history and positive malaria test",
+        ("fever", "recent_travel"),
+        lambda tr: tr.get("Malaria"),
+    ),
+    (
+        "Typhoid", 65, "Fever with gastrointestinal symptoms and positive test",
+        ("fever", "nausea", "diarrhea"),
+        lambda tr: tr.get("Typhoid"),
+    ),
+)
+
+ANALYSIS_MODEL = "deepseek/deepseek-chat-v3.1:free"
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Static instructions stay in the system message so the provider can reuse
+# the cached prompt prefix; only the user data changes between requests.
+SYSTEM_PROMPT = (
+    "You are a helpful assistant for educational symptom checking. "
+    "Always include a disclaimer that this is not medical advice.\n\n"
+    "Based on the user data you are given, list the top 3 most likely "
+    "diseases with confidence percentages and reasoning for each. "
+    "Also suggest next steps.\n\n"
+    "Provide response in a clear, structured format."
+)
+
+# Batch requests in flight at once, and SDK retries (with exponential
+# backoff) on rate limits, 5xx responses and connection errors
+BATCH_MAX_CONCURRENCY = 8
+BATCH_MAX_RETRIES = 5
+
+# Streamed deltas are often a few characters; batch them before yielding
+STREAM_FLUSH_CHARS = 64
+
+# Completed analyses, keyed by a hash of the user data and model
+CACHE_MAX_ENTRIES = 128
+CACHE_TTL_SECONDS = 3600
+CACHE_CHUNK_SIZE = 50
+_analysis_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Analyses hold health data and are stored unencrypted, so persisting them
+# between runs is opt-in: set this variable, in the environment or .env, to
+# a shelf path
+CACHE_PATH_ENV = "SYMPTOM_CHECKER_CACHE_PATH"
+CACHE_DISK_MAX_ENTRIES = 1000
+# Past the limit the shelf is trimmed to this size in one pass, so only one
+# save in every hundred has to read the timestamps of every entry
+CACHE_DISK_LOW_WATER = 900
+# Serializes shelf access separately so memory hits never wait on disk I/O
+_disk_lock = threading.Lock()
+# What reading a truncated, corrupt or incompatible shelf entry can raise
+_DISK_ENTRY_ERRORS = (
+    pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+    TypeError, ValueError, *dbm.error,
+)
+
+
+def _ask(prompt):
+    """Prompt for one stripped answer; piped input skips input()'s tty handling."""
+    if sys.stdin.isatty():
+        return input(prompt).strip()
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    return sys.stdin.readline().strip()
+
+
 def get_basic_info():
     """Collect basic user information."""
     print("Welcome to the Smart Diagnosis Assistant")
     print("-----------------------------------------")
 
     try:
-        age = int(input("Enter your age: "))
+        age = int(_ask("Enter your age: "))
     except ValueError:
         age = None
         print("Invalid age entered. Skipping.")
 
-    gender = input("Gender (M/F): ").strip().upper()
+    gender = _ask("Gender (M/F): ").upper()
     if gender not in ["M", "F"]:
         gender = None
         print("Invalid gender. Skipping.")
 
     try:
-        weight = float(input("Enter your weight (kg): "))
+        weight = float(_ask("Enter your weight (kg): "))
     except ValueError:
         weight = None
         print("Invalid weight. Skipping.")
 
     try:
-        temperature = float(input("Enter your temperature (°C): "))
+        temperature = float(_ask("Enter your temperature (°C): "))
     except ValueError:
         temperature = None
         print("Invalid temperature. Skipping.")
 
-    duration = input("Duration of symptoms (in days): ").strip()
+    duration = _ask("Duration of symptoms (in days): ")
     if not duration.isdigit():
         duration = None
         print("Invalid duration. Skipping.")
 
-    chronic_diseases = (
-        input("Any chronic diseases (e.g., diabetes, hypertension)? (y/n): ")
-        .strip()
-        .lower()
-    )
+    chronic_diseases = _ask(
+        "Any chronic diseases (e.g., diabetes, hypertension)? (y/n): "
+    ).lower()
     chronic_diseases = chronic_diseases == "y"
 
     return {
@@ -62,43 +217,34 @@ def get_basic_info():
 def get_symptoms():
     """Ask for symptoms with yes/no questions."""
     symptoms = {}
-    symptom_questions = {
-        "fever": "Do you have fever? (y/n): ",
-        "fatigue": "Do you have fatigue? (y/n): ",
-        "cough": "Do you have cough? (y/n): ",
-        "headache": "Do you have headache? (y/n): ",
-        "body_pain": "Do you have body pain? (y/n): ",
-        "nausea": "Do you have nausea? (y/n): ",
-        "vomiting": "Do you have vomiting? (y/n): ",
-        "diarrhea": "Do you have diarrhea? (y/n): ",
-        "rash": "Do you have rash? (y/n): ",
-        "sore_throat": "Do you have sore throat? (y/n): ",
-        "shortness_of_breath": "Do you have shortness of breath? (y/n): ",
-        "chest_pain": "Do you have chest pain? (y/n): ",
-        "confusion": "Do you have confusion? (y/n): ",
-        "recent_travel": "Recent travel or mosquito bites? (y/n): ",
-        "medication": "Any medication taken recently? (y/n): ",
-        "appetite_change": "Appetite changes? (y/n): ",
-        "urine_change": "Urine changes? (y/n): ",
-        "weight_loss": "Weight loss? (y/n): ",
-        "night_sweats": "Night sweats? (y/n): ",
-        "exposure": "Recent exposure to someone sick? (y/n): ",
-    }
+    for symptom, question in _SYMPTOM_QUESTIONS:
+        answer = _ask(question).lower()
+        symptoms[symptom] = answer == "y"
+
+    return _get_symptom_details(symptoms)
 
-    for symptom, question in symptom_questions.items():
-        answer = input(question).strip().lower()
+
+def get_symptoms_batch(line):
+    """Parse one line of space- or comma-separated y/n answers in question order."""
+    symptoms = dict.fromkeys((symptom for symptom, _ in _SYMPTOM_QUESTIONS), False)
+    answers = line.lower().replace(",", " ").split()
+    for (symptom, _), answer in zip(_SYMPTOM_QUESTIONS, answers):
         symptoms[symptom] = answer == "y"
 
-    # Additional details for some symptoms
+    return _get_symptom_details(symptoms)
+
+
+def _get_symptom_details(symptoms):
+    """Ask follow-up questions for symptoms that need more detail."""
     if symptoms.get("fever"):
         try:
-            duration_fever = int(input("Duration of fever (in days): "))
+            duration_fever = int(_ask("Duration of fever (in days): "))
             symptoms["fever_duration"] = duration_fever
         except ValueError:
             symptoms["fever_duration"] = None
 
     if symptoms.get("cough"):
-        cough_type = input("Cough type (dry/productive): ").strip().lower()
+        cough_type = _ask("Cough type (dry/productive): ").lower()
         symptoms["cough_type"] = (
             cough_type if cough_type in ["dry", "productive"] else None
         )
@@ -109,54 +255,28 @@ def get_symptoms():
 def get_test_results():
     """Ask for diagnostic test results."""
     test_results = {}
-    has_tests = input("Do you have blood test results? (y/n): ").strip().lower()
+    has_tests = _ask("Do you have blood test results? (y/n): ").lower()
     if has_tests != "y":
         return test_results
 
-    test_questions = {
-        "WBC": "Enter WBC count: ",
-        "Platelets": "Enter Platelet count: ",
-        "Hemoglobin": "Enter Hemoglobin level: ",
-        "Blood_Sugar": "Enter Blood Sugar level: ",
-        "ALT": "Enter ALT (Liver) level: ",
-        "Creatinine": "Enter Creatinine (Kidney) level: ",
-        "Malaria": "Malaria test result (positive/negative): ",
-        "Dengue": "Dengue test result (positive/negative): ",
-        "Typhoid": "Typhoid test result (positive/negative): ",
-    }
-
-    for test, question in test_questions.items():
-        value = input(question).strip()
-        if value:
-            if test in ["Malaria", "Dengue", "Typhoid"]:
-                test_results[test] = value.lower() == "positive"
-            else:
-                try:
-                    test_results[test] = float(value)
-                except ValueError:
-                    print(f"Invalid value for {test}. Skipping.")
-        else:
+    for test, question in _TEST_QUESTIONS:
+        value = _ask(question)
+        if not value:
             test_results[test] = None
+            continue
+        try:
+            test_results[test] = _TEST_PARSERS[test](value)
+        except ValueError:
+            print(f"Invalid value for {test}. Skipping.")
 
     return test_results
 
 
 def check_emergency(symptoms, basic_info):
     """Check for severe symptoms and alert."""
-    severe = False
-    reasons = []
-
-    if basic_info.get("temperature") and basic_info["temperature"] > 40:
-        severe = True
-        reasons.append("High fever (>40°C)")
-
-    if symptoms.get("confusion") and symptoms.get("fever"):
-        severe = True
-        reasons.append("Fever with confusion")
-
-    if symptoms.get("shortness_of_breath") and symptoms.get("chest_pain"):
-        severe = True
-        reasons.append("Shortness of breath with chest pain")
+    sg, bi = symptoms.get, basic_info.get
+    reasons = [reason for rule, reason in _EMERGENCY_RULES if rule(sg, bi)]
+    severe = bool(reasons)
 
     if severe:
         print(
@@ -168,43 +288,285 @@ def check_emergency(symptoms, basic_info):
     return severe, reasons
 
 
-def get_symptom_analysis(user_data):
+def _drop_none(value):
+    """Recursively drop None-valued keys; unanswered fields cost prompt tokens."""
+    if isinstance(value, dict):
+        return {k: _drop_none(v) for k, v in value.items() if v is not None}
+    return value
+
+
+def _serialize_user_data(user_data):
+    """Serialize user data to compact, key-sorted JSON without empty fields."""
+    return json.dumps(
+        _drop_none(user_data), sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+def _analysis_cache_key(payload):
+    """Build a stable cache key for a serialized analysis request."""
+    key_source = payload + ANALYSIS_MODEL + SYSTEM_PROMPT
+    return hashlib.blake2b(key_source.encode("utf-8")).hexdigest()
+
+
+def _get_cached_analysis(key):
+    """Return the cached analysis chunks from memory or disk, or None."""
+    with _cache_lock:
+        entry = _analysis_cache.get(key)
+        if entry is not None:
+            stored_at, chunks = entry
+            if time.monotonic() - stored_at <= CACHE_TTL_SECONDS:
+                _analysis_cache.move_to_end(key)
+                return chunks
+            del _analysis_cache[key]
+
+    entry = _load_from_disk(key)
+    if entry is None:
+        return None
+    age, chunks = entry
+    with _cache_lock:
+        _remember_analysis(key, time.monotonic() - age, chunks)
+    return chunks
+
+
+def _store_analysis(key, analysis):
+    """Cache a completed analysis in memory and on disk."""
+    # Stored pre-chunked so cache hits replay without re-slicing
+    chunks = tuple(
+        analysis[i:i + CACHE_CHUNK_SIZE]
+        for i in range(0, len(analysis), CACHE_CHUNK_SIZE)
+    )
+    with _cache_lock:
+        _remember_analysis(key, time.monotonic(), chunks)
+    _save_to_disk(key, chunks)
+
+
+def _remember_analysis(key, stored_at, chunks):
+    """Add chunks to the memory cache, evicting the least recently used."""
+    _analysis_cache[key] = (stored_at, chunks)
+    _analysis_cache.move_to_end(key)
+    while len(_analysis_cache) > CACHE_MAX_ENTRIES:
+        _analysis_cache.popitem(last=False)
+
+
+def _cache_path():
+    """Return the configured shelf path, or None when the disk tier is off."""
+    # Read after .env is loaded, so the path can live there next to KEY
+    _load_env()
+    path = os.getenv(CACHE_PATH_ENV)
+    return os.path.expanduser(path) if path else None
+
+
+def _open_disk_cache():
+    """Open the persistent cache shelf, or return None if it is unavailable."""
+    path = _cache_path()
+    if path is None:
+        return None
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return shelve.open(path)
+    except (OSError, *dbm.error):
+        # Unwritable home directory, or another process holds the lock
+        return None
+
+
+def _load_from_disk(key):
+    """Return (age in seconds, chunks) for a fresh disk entry, or None."""
+    with _disk_lock:
+        db = _open_disk_cache()
+        if db is None:
+            return None
+        with db:
+            entry = _read_disk_entry(db, key)
+            if entry is None:
+                return None
+            if entry[0] > CACHE_TTL_SECONDS:
+                del db[key]
+                return None
+    return entry
+
+
+def _save_to_disk(key, chunks):
+    """Persist chunks, dropping the oldest entries beyond the disk limit."""
+    with _disk_lock:
+        db = _open_disk_cache()
+        if db is None:
+            return
+        with db:
+            db[key] = (time.time(), chunks)
+            if len(db) > CACHE_DISK_MAX_ENTRIES:
+                _evict_oldest(db)
+
+
+def _evict_oldest(db):
+    """Trim an open shelf to CACHE_DISK_LOW_WATER entries, oldest first."""
+    saved = []
+    for key in list(db):
+        entry = _read_disk_entry(db, key)
+        if entry is not None:
+            saved.append((entry[0], key))
+    for _, old_key in heapq.nlargest(len(saved) - CACHE_DISK_LOW_WATER, saved):
+        del db[old_key]
+
+
+def _read_disk_entry(db, key):
+    """Return (age in seconds, chunks) for a shelf entry; unreadable ones are dropped."""
+    try:
+        entry = db.get(key)
+        if entry is None:
+            return None
+        saved_at, chunks = entry
+        return time.time() - saved_at, chunks
+    except _DISK_ENTRY_ERRORS:
+        # Treat a damaged entry as a miss so the analysis is fetched again
+        try:
+            del db[key]
+        except (KeyError, *dbm.error):
+            pass
+        return None
+
+
+@lru_cache(maxsize=1)
+def _load_env():
+    """Load .env on first use; dotenv is imported only when a key is needed."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def _get_client(api_key):
+    """Return a shared OpenRouter client so connections are reused."""
+    # The openai SDK is slow to import, so defer it until a request is made
+    from openai import OpenAI
+
+    return OpenAI(
+        base_url=OPENROUTER_BASE_URL,
+        api_key=api_key,
+    )
+
+
+def _get_api_key():
+    """Return the OpenRouter key from the environment or .env."""
+    _load_env()
     api_key = os.getenv("KEY")
     if not api_key:
         raise ValueError("Error: KEY not found. Please install required dependencies and set the environment variable.")
+    return api_key
 
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
 
-    prompt = f"""Based on the following user data, list the top 3 most likely diseases with confidence percentages and reasoning for each. Also suggest next steps.
+def _build_messages(payload):
+    """Build the chat messages for one serialized user record."""
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"User Data: {payload}"
+        }
+    ]
 
-    User Data: {user_data}
 
-    Provide response in a clear, structured format."""
+def get_symptom_analysis(user_data):
+    payload = _serialize_user_data(user_data)
+    cache_key = _analysis_cache_key(payload)
+    cached = _get_cached_analysis(cache_key)
+    if cached is not None:
+        yield from cached
+        return
+
+    client = _get_client(_get_api_key())
 
     try:
-        stream = client.chat.completions.create(
-            model="deepseek/deepseek-chat-v3.1:free",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant for educational symptom checking. Always include a disclaimer that this is not medical advice."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+        # The with block closes the HTTP response even when the caller stops
+        # iterating early and this generator is closed
+        with client.chat.completions.create(
+            model=ANALYSIS_MODEL,
+            messages=_build_messages(payload),
             stream=True
+        ) as stream:
+            parts = []
+            pending = []
+            pending_len = 0
+            for chunk in stream:
+                content = chunk.choices[0].delta.content
+                if content is not None:
+                    parts.append(content)
+                    pending.append(content)
+                    pending_len += len(content)
+                    if pending_len >= STREAM_FLUSH_CHARS:
+                        yield "".join(pending)
+                        pending = []
+                        pending_len = 0
+        if pending:
+            yield "".join(pending)
+    except Exception as e:
+        raise Exception(f"API response failed: {e}. Please check your API key and internet connection.")
+
+    # An empty completion is not worth replaying; let the next request retry
+    if parts:
+        _store_analysis(cache_key, "".join(parts))
+
+
+async def get_symptom_analysis_async(user_data, client):
+    """Return the complete analysis for one user from an AsyncOpenAI client."""
+    payload = _serialize_user_data(user_data)
+    cache_key = _analysis_cache_key(payload)
+    # Cache access takes a lock and may hit the disk, so keep it off the loop
+    # (run_in_executor rather than to_thread, which needs Python 3.9)
+    loop = asyncio.get_running_loop()
+    cached = await loop.run_in_executor(None, _get_cached_analysis, cache_key)
+    if cached is not None:
+        return "".join(cached)
+
+    try:
+        response = await client.chat.completions.create(
+            model=ANALYSIS_MODEL,
+            messages=_build_messages(payload),
         )
-        for chunk in stream:
-            if chunk.choices[0].delta.content is not None:
-                yield chunk.choices[0].delta.content
     except Exception as e:
         raise Exception(f"API response failed: {e}. Please check your API key and internet connection.")
 
+    analysis = response.choices[0].message.content or ""
+    if not analysis:
+        # Reported as this user's error by analyze_batch, and never cached
+        raise Exception("API response failed: the model returned an empty analysis.")
+    await loop.run_in_executor(None, _store_analysis, cache_key, analysis)
+    return analysis
+
+
+async def _analyze_batch(users):
+    """Run every analysis on one async client, closing it when done."""
+    from openai import AsyncOpenAI
+
+    # Created inside the running loop; bounds requests so a large batch
+    # stays under the provider's rate limit
+    limit = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def analyze_one(user_data):
+        async with limit:
+            return await get_symptom_analysis_async(user_data, client)
+
+    async with AsyncOpenAI(
+        base_url=OPENROUTER_BASE_URL,
+        api_key=_get_api_key(),
+        max_retries=BATCH_MAX_RETRIES,
+    ) as client:
+        return await asyncio.gather(
+            *(analyze_one(user_data) for user_data in users),
+            return_exceptions=True,
+        )
+
+
+def analyze_batch(users):
+    """Analyze several users concurrently; results follow the input order.
+
+    A user whose request fails gets its exception in place of an analysis,
+    so one failure does not discard the other users' results.
+    """
+    return asyncio.run(_analyze_batch(users))
+
 
 def get_mock_analysis(user_data):
     """Generate mock analysis based on symptoms and test results for testing purposes."""
@@ -213,85 +575,48 @@ def get_mock_analysis(user_data):
     basic_info = user_data.get("basic_info", {})
 
     # Simple rule-based analysis
-    diseases = []
-
-    # Check for Dengue
-    if (
-        symptoms.get("fever")
-        and symptoms.get("rash")
-        and symptoms.get("recent_travel")
-        and test_results.get("Dengue")
-        and test_results.get("Platelets", 200000) < 100000
-    ):
-        diseases.append(
-            ("Dengue", 75, "High fever, rash, low platelets, positive dengue test")
-        )
-
-    # Check for Viral Fever
-    if (
-        symptoms.get("fever")
-        and symptoms.get("fatigue")
-        and symptoms.get("headache")
-        and not test_results.get("Dengue")
-        and not test_results.get("Malaria")
-    ):
-        diseases.append(
-            ("Viral Fever", 60, "Common flu-like symptoms with normal test results")
-        )
-
-    # Check for Malaria
-    if (
-        symptoms.get("fever")
-        and symptoms.get("recent_travel")
-        and test_results.get("Malaria")
-    ):
-        diseases.append(
-            ("Malaria", 70, "Fever with travel history and positive malaria test")
-        )
-
-    # Check for Typhoid
-    if (
-        symptoms.get("fever")
-        and symptoms.get("nausea")
-        and symptoms.get("diarrhea")
-        and test_results.get("Typhoid")
-    ):
-        diseases.append(
-            ("Typhoid", 65, "Fever with gastrointestinal symptoms and positive test")
-        )
+    sg = symptoms.get
+    diseases = [
+        (disease, confidence, reasoning)
+        for disease, confidence, reasoning, required, test_check in _MOCK_RULES
+        if all(map(sg, required)) and test_check(test_results)
+    ]
 
     # Default fallback
     if not diseases:
         diseases.append(("Common Cold", 40, "Mild symptoms, could be various causes"))
 
-    # Sort by confidence
-    diseases.sort(key=lambda x: x[1], reverse=True)
+    # Keep the three most confident matches
+    top_diseases = heapq.nlargest(3, diseases, key=itemgetter(1))
 
     # Format response
-    response = "Top Possible Conditions:\n"
-    for i, (disease, confidence, reasoning) in enumerate(diseases[:3], 1):
-        response += f"{i}. {disease} – {confidence}%\n"
-        response += f"   Reasoning: {reasoning}\n"
+    parts = ["Top Possible Conditions:\n"]
+    for i, (disease, confidence, reasoning) in enumerate(top_diseases, 1):
+        parts.append(f"{i}. {disease} – {confidence}%\n")
+        parts.append(f"   Reasoning: {reasoning}\n")
 
     # Add suggestions
-    response += "\nSuggested Actions:\n"
+    parts.append("\nSuggested Actions:\n")
     if basic_info.get("temperature", 0) > 39:
-        response += "- Monitor temperature closely\n"
+        parts.append("- Monitor temperature closely\n")
     if symptoms.get("fever"):
-        response += "- Stay hydrated and rest\n"
-    response += "- Consult a healthcare professional for proper diagnosis\n"
+        parts.append("- Stay hydrated and rest\n")
+    parts.append("- Consult a healthcare professional for proper diagnosis\n")
     if test_results:
-        response += "- Follow up with additional tests if recommended\n"
+        parts.append("- Follow up with additional tests if recommended\n")
 
-    return response
+    return "".join(parts)
 
 
 if __name__ == "__main__":
     # Step 1: Collect basic information
     basic_info = get_basic_info()
 
-    # Step 2: Ask for symptoms
-    symptoms = get_symptoms()
+    # Step 2: Ask for symptoms, all on one line with --batch
+    if "--batch" in sys.argv[1:]:
+        symptoms = get_symptoms_batch(_ask(_SYMPTOM_BATCH_PROMPT))
+    else:
+        symptoms = get_symptoms()
 
     # Step 3: Ask for test results
     test_results = get_test_results()
@@ -304,13 +629,14 @@ if __name__ == "__main__":
     }
 
     # Step 5: Check for emergency
-    emergency = check_emergency(symptoms, basic_info)
+    emergency, _ = check_emergency(symptoms, basic_info)
 
     if not emergency:
         # Step 6: Get AI analysis
-        analysis = get_symptom_analysis(user_data)
         print("\nAnalysis:")
-        print(analysis)
+        for chunk in get_symptom_analysis(user_data):
+            print(chunk, end="", flush=True)
+        print()
     else:
         print(
             "Due to emergency symptoms, analysis skipped. Please seek immediate medical help."
@@ -1,13 +1,475 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import os
+from tkinter import ttk, scrolledtext, END, WORD
+import re
+import sys
 import threading
-from dotenv import load_dotenv
-from openai import OpenAI
-import markdown
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from html.parser import HTMLParser
+from types import MappingProxyType
 from symptom_checker import get_symptom_analysis, check_emergency
 
-load_dotenv()
+# Symptom keys paired with their checkbox labels, built once at import
+_SYMPTOMS = tuple(
+    (symptom, symptom.replace('_', ' ').title())
+    for symptom in (
+        "fever", "fatigue", "cough", "headache", "body_pain", "nausea",
+        "vomiting", "diarrhea", "rash", "sore_throat", "shortness_of_breath",
+        "chest_pain", "confusion", "recent_travel", "medication", "appetite_change",
+        "urine_change", "weight_loss", "night_sweats", "exposure"
+    )
+)
+
+# Quick Fill button labels and the sample each one loads
+_SAMPLE_BUTTONS = (
+    ("Viral Fever", "viral_fever"),
+    ("Dengue", "dengue"),
+    ("Hep A", "hep_a"),
+    ("TB", "tuberculosis"),
+    ("CKD", "ckd"),
+    ("Diabetes", "diabetes"),
+    ("Emergency", "emergency"),
+)
+
+_NUMERIC_TESTS = ("WBC", "Platelets", "Hemoglobin", "Blood_Sugar", "ALT", "Creatinine")
+_BOOLEAN_TESTS = ("Malaria", "Dengue", "Typhoid")
+
+# Delay before recomputing a canvas scrollregion after its frame resizes
+_SCROLLREGION_DELAY_MS = 50
+
+# Banner colour and auto-dismiss delay (None keeps it up) per severity
+_BANNER_STYLES = MappingProxyType({
+    "emergency": ("red", None),
+    "error": ("dark orange", 8000),
+})
+
+# Sample data from test file, shared read-only across UI instances
+_SAMPLE_DATA = MappingProxyType({
+    "viral_fever": {
+        "basic_info": {
+            "age": 25,
+            "gender": "M",
+            "weight": 70.0,
+            "temperature": 38.5,
+            "duration": "3",
+            "chronic_diseases": False
+        },
+        "symptoms": {
+            "fever": True,
+            "fatigue": True,
+            "cough": False,
+            "headache": True,
+            "body_pain": True,
+            "nausea": False,
+            "vomiting": False,
+            "diarrhea": False,
+            "rash": False,
+            "sore_throat": True,
+            "shortness_of_breath": False,
+            "chest_pain": False,
+            "confusion": False,
+            "recent_travel": False,
+            "medication": False,
+            "appetite_change": True,
+            "urine_change": False,
+            "weight_loss": False,
+            "night_sweats": False,
+            "exposure": False,
+            "fever_duration": 3,
+            "cough_type": None
+        },
+        "test_results": {
+            "WBC": 6500,
+            "Platelets": 180000,
+            "Hemoglobin": 14.0,
+            "Blood_Sugar": 90,
+            "ALT": 25,
+            "Creatinine": 0.8,
+            "Malaria": False,
+            "Dengue": False,
+            "Typhoid": False
+        }
+    },
+    "dengue": {
+        "basic_info": {
+            "age": 30,
+            "gender": "F",
+            "weight": 60.0,
+            "temperature": 39.2,
+            "duration": "5",
+            "chronic_diseases": False
+        },
+        "symptoms": {
+            "fever": True,
+            "fatigue": True,
+            "cough": False,
+            "headache": True,
+            "body_pain": True,
+            "nausea": True,
+            "vomiting": False,
+            "diarrhea": False,
+            "rash": True,
+            "sore_throat": False,
+            "shortness_of_breath": False,
+            "chest_pain": False,
+            "confusion": False,
+            "recent_travel": True,
+            "medication": False,
+            "appetite_change": True,
+            "urine_change": False,
+            "weight_loss": False,
+            "night_sweats": False,
+            "exposure": False,
+            "fever_duration": 5,
+            "cough_type": None
+        },
+        "test_results": {
+            "WBC": 3000,
+            "Platelets": 80000,
+            "Hemoglobin": 12.5,
+            "Blood_Sugar": 95,
+            "ALT": 45,
+            "Creatinine": 0.9,
+            "Malaria": False,
+            "Dengue": True,
+            "Typhoid": False
+        }
+    },
+    "hep_a": {
+        "basic_info": {
+            "age": 35,
+            "gender": "M",
+            "weight": 75.0,
+            "temperature": 38.0,
+            "duration": "7",
+            "chronic_diseases": False
+        },
+        "symptoms": {
+            "fever": True,
+            "fatigue": True,
+            "cough": False,
+            "headache": False,
+            "body_pain": False,
+            "nausea": True,
+            "vomiting": True,
+            "diarrhea": True,
+            "rash": False,
+            "sore_throat": False,
+            "shortness_of_breath": False,
+            "chest_pain": False,
+            "confusion": False,
+            "recent_travel": True,
+            "medication": False,
+            "appetite_change": True,
+            "urine_change": True,
+            "weight_loss": True,
+            "night_sweats": False,
+            "exposure": False,
+            "fever_duration": 7,
+            "cough_type": None
+        },
+        "test_results": {
+            "WBC": 5500,
+            "Platelets": 150000,
+            "Hemoglobin": 13.5,
+            "Blood_Sugar": 85,
+            "ALT": 120,
+            "Creatinine": 0.9,
+            "Malaria": False,
+            "Dengue": False,
+            "Typhoid": False
+        }
+    },
+    "tuberculosis": {
+        "basic_info": {
+            "age": 40,
+            "gender": "F",
+            "weight": 55.0,
+            "temperature": 37.8,
+            "duration": "30",
+            "chronic_diseases": False
+        },
+        "symptoms": {
+            "fever": True,
+            "fatigue": True,
+            "cough": True,
+            "headache": False,
+            "body_pain": False,
+            "nausea": False,
+            "vomiting": False,
+            "diarrhea": False,
+            "rash": False,
+            "sore_throat": False,
+            "shortness_of_breath": True,
+            "chest_pain": True,
+            "confusion": False,
+            "recent_travel": False,
+            "medication": False,
+            "appetite_change": True,
+            "urine_change": False,
+            "weight_loss": True,
+            "night_sweats": True,
+            "exposure": True,
+            "fever_duration": 30,
+            "cough_type": "productive"
+        },
+        "test_results": {
+            "WBC": 8000,
+            "Platelets": 200000,
+            "Hemoglobin": 11.0,
+            "Blood_Sugar": 95,
+            "ALT": 30,
+            "Creatinine": 0.8,
+            "Malaria": False,
+            "Dengue": False,
+            "Typhoid": False
+        }
+    },
+    "ckd": {
+        "basic_info": {
+            "age": 55,
+            "gender": "M",
+            "weight": 85.0,
+            "temperature": 36.8,
+            "duration": "90",
+            "chronic_diseases": True
+        },
+        "symptoms": {
+            "fever": False,
+            "fatigue": True,
+            "cough": False,
+            "headache": False,
+            "body_pain": False,
+            "nausea": True,
+            "vomiting": True,
+            "diarrhea": False,
+            "rash": False,
+            "sore_throat": False,
+            "shortness_of_breath": True,
+            "chest_pain": False,
+            "confusion": False,
+            "recent_travel": False,
+            "medication": True,
+            "appetite_change": True,
+            "urine_change": True,
+            "weight_loss": True,
+            "night_sweats": False,
+            "exposure": False,
+            "fever_duration": None,
+            "cough_type": None
+        },
+        "test_results": {
+            "WBC": 7000,
+            "Platelets": 180000,
+            "Hemoglobin": 9.5,
+            "Blood_Sugar": 140,
+            "ALT": 35,
+            "Creatinine": 3.2,
+            "Malaria": False,
+            "Dengue": False,
+            "Typhoid": False
+        }
+    },
+    "diabetes": {
+        "basic_info": {
+            "age": 50,
+            "gender": "F",
+            "weight": 90.0,
+            "temperature": 36.5,
+            "duration": "180",
+            "chronic_diseases": True
+        },
+        "symptoms": {
+            "fever": False,
+            "fatigue": True,
+            "cough": False,
+            "headache": False,
+            "body_pain": False,
+            "nausea": False,
+            "vomiting": False,
+            "diarrhea": False,
+            "rash": False,
+            "sore_throat": False,
+            "shortness_of_breath": False,
+            "chest_pain": False,
+            "confusion": False,
+            "recent_travel": False,
+            "medication": True,
+            "appetite_change": True,
+            "urine_change": True,
+            "weight_loss": True,
+            "night_sweats": False,
+            "exposure": False,
+            "fever_duration": None,
+            "cough_type": None
+        },
+        "test_results": {
+            "WBC": 6500,
+            "Platelets": 200000,
+            "Hemoglobin": 12.0,
+            "Blood_Sugar": 280,
+            "ALT": 40,
+            "Creatinine": 1.1,
+            "Malaria": False,
+            "Dengue": False,
+            "Typhoid": False
+        }
+    },
+    "emergency": {
+        "basic_info": {
+            "age": 45,
+            "gender": "M",
+            "weight": 80.0,
+            "temperature": 40.5,
+            "duration": "2",
+            "chronic_diseases": True
+        },
+        "symptoms": {
+            "fever": True,
+            "fatigue": True,
+            "cough": False,
+            "headache": True,
+            "body_pain": True,
+            "nausea": False,
+            "vomiting": False,
+            "diarrhea": False,
+            "rash": False,
+            "sore_throat": False,
+            "shortness_of_breath": True,
+            "chest_pain": True,
+            "confusion": True,
+            "recent_travel": False,
+            "medication": True,
+            "appetite_change": False,
+            "urine_change": False,
+            "weight_loss": False,
+            "night_sweats": False,
+            "exposure": False,
+            "fever_duration": 2,
+            "cough_type": None
+        },
+        "test_results": {}
+    }
+})
+
+def _parse_int(text):
+    """Parse an integer entry, returning None when blank or invalid."""
+    try:
+        return int(text) if text else None
+    except ValueError:
+        return None
+
+
+def _parse_float(text):
+    """Parse a numeric entry, returning None when blank or invalid."""
+    try:
+        return float(text) if text else None
+    except ValueError:
+        return None
+
+
+def _parse_gender(text):
+    """Normalize a gender entry to M/F, or None."""
+    gender = text.strip().upper()
+    return gender if gender in ("M", "F") else None
+
+
+def _parse_text(text):
+    """Strip a free-text entry, returning None when blank."""
+    return text.strip() or None
+
+
+def _parse_cough_type(text):
+    """Normalize a cough type entry to dry/productive, or None."""
+    cough_type = text.strip().lower()
+    return cough_type if cough_type in ("dry", "productive") else None
+
+
+def _parse_result(text):
+    """Parse a positive/negative test entry to True/False, or None."""
+    value = text.strip().lower()
+    return value == "positive" if value in ("positive", "negative") else None
+
+
+def _format_text(value):
+    """Render a sample value for an entry, leaving it blank when falsy."""
+    return str(value) if value else ""
+
+
+def _format_number(value):
+    """Render a sample test value, leaving it blank only when missing."""
+    return str(value) if value is not None else ""
+
+
+def _format_result(value):
+    """Render a sample positive/negative test result."""
+    if value is None:
+        return ""
+    return "positive" if value else "negative"
+
+
+_BLANK_LINES = re.compile(r'\n\s*\n\s*\n+')
+_HEADING_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+
+
+@lru_cache(maxsize=1)
+def _get_markdown():
+    """Return a shared Markdown converter so extensions are set up once."""
+    # markdown (and Pygments via codehilite) load on the first finished analysis
+    import markdown
+
+    return markdown.Markdown(extensions=['extra', 'codehilite'])
+
+
+@lru_cache(maxsize=32)
+def _render_markdown(text):
+    """Render analysis markdown to HTML, reusing results for repeat analyses."""
+    return _get_markdown().reset().convert(text)
+
+
+class _PlainTextParser(HTMLParser):
+    """Flatten rendered markdown HTML into plain text in a single pass."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        # Loose list items wrap their text in <p>; keep it on the bullet's line
+        self.item_start = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _HEADING_TAGS or tag == "br":
+            self.parts.append("\n")
+        elif tag == "li":
+            self.parts.append("• ")
+            self.item_start = True
+
+    def handle_endtag(self, tag):
+        if tag in _HEADING_TAGS:
+            self.parts.append("\n" + "=" * 50 + "\n")
+        elif tag == "li":
+            self.parts.append("\n")
+        elif tag == "p":
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if self.item_start:
+            data = data.lstrip()
+            if not data:
+                return
+            self.item_start = False
+        self.parts.append(data)
+
+
+def _html_to_plain_text(html):
+    """Flatten rendered markdown HTML into the text shown in the output pane."""
+    # Headings get an underline, list items a bullet; other tags are dropped
+    parser = _PlainTextParser()
+    parser.feed(html)
+    parser.close()
+
+    # Clean up extra whitespace
+    return _BLANK_LINES.sub('\n\n', "".join(parser.parts)).strip()
+
 
 class SymptomCheckerUI:
     def __init__(self, root):
@@ -38,8 +500,28 @@ class SymptomCheckerUI:
         # Loading state
         self.is_loading = False
 
+        # Streamed text waiting to be flushed into the output widget
+        self.pending_chunks = []
+        self.flush_scheduled = False
+        self.pending_lock = threading.Lock()
+
+        # One reusable worker runs analyses; closing the window shuts it down
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analysis')
+        self.current_future = None
+        self.closing = False
+        self.root.protocol('WM_DELETE_WINDOW', self.close)
+
+        # Pending scrollregion updates, keyed by canvas
+        self.scrollregion_jobs = {}
+
+        # Canvases made by make_scrollable; one wheel handler serves them all
+        # (<MouseWheel> on Windows/macOS, buttons 4 and 5 on X11)
+        self.scroll_canvases = set()
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.root.bind_all(sequence, self.on_mousewheel)
+
         # Sample data from test file
-        self.sample_data = self.load_sample_data()
+        self.sample_data = _SAMPLE_DATA
 
         # Setup each tab
         self.setup_basic_info_tab()
@@ -47,6 +529,38 @@ class SymptomCheckerUI:
         self.setup_tests_tab()
         self.setup_analysis_tab()
 
+        # Every input variable reset by clear_all
+        self.clear_string_vars = tuple(
+            var for var, _, _ in (*self.basic_fields, *self.symptom_fields, *self.test_fields)
+        )
+        self.clear_bool_vars = (self.chronic_var, *self.symptom_vars.values())
+        # The same resets as one Tcl script, so Clear is a single interpreter call
+        self.clear_script = "\n".join((
+            *(f"set {var} {{}}" for var in self.clear_string_vars),
+            *(f"set {var} 0" for var in self.clear_bool_vars),
+        ))
+
+        # Variables filled by the Quick Fill buttons, per section of the sample data
+        self.sample_fields = {
+            "basic_info": (
+                (self.age_var, _format_text, "age"),
+                (self.gender_var, _format_text, "gender"),
+                (self.weight_var, _format_text, "weight"),
+                (self.temp_var, _format_text, "temperature"),
+                (self.duration_var, _format_text, "duration"),
+                (self.chronic_var, bool, "chronic_diseases"),
+            ),
+            "symptoms": (
+                *((var, bool, symptom) for symptom, var in self.symptom_vars.items()),
+                (self.fever_duration_var, _format_text, "fever_duration"),
+                (self.cough_type_var, _format_text, "cough_type"),
+            ),
+            "test_results": (
+                *((var, _format_number, test) for test, var in self.test_vars.items()),
+                *((var, _format_result, test) for test, var in self.boolean_test_vars.items()),
+            ),
+        }
+
     def setup_basic_info_tab(self):
         frame = self.basic_info_frame
 
@@ -83,17 +597,19 @@ class SymptomCheckerUI:
         self.chronic_var = tk.BooleanVar()
         ttk.Checkbutton(frame, text="Yes", variable=self.chronic_var).pack(anchor='w', padx=40, pady=(0,10))
 
+        # (variable, parser, key) for each entry read by collect_basic_info
+        self.basic_fields = (
+            (self.age_var, _parse_int, "age"),
+            (self.gender_var, _parse_gender, "gender"),
+            (self.weight_var, _parse_float, "weight"),
+            (self.temp_var, _parse_float, "temperature"),
+            (self.duration_var, _parse_text, "duration"),
+        )
+
         # Sample data buttons
         sample_frame = ttk.Frame(frame)
         sample_frame.pack(fill='x', padx=20, pady=(10,0))
-        ttk.Label(sample_frame, text="Quick Fill:").pack(side='left')
-        ttk.Button(sample_frame, text="Viral Fever", command=lambda: self.load_sample_basic_info("viral_fever")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Dengue", command=lambda: self.load_sample_basic_info("dengue")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Hep A", command=lambda: self.load_sample_basic_info("hep_a")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="TB", command=lambda: self.load_sample_basic_info("tuberculosis")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="CKD", command=lambda: self.load_sample_basic_info("ckd")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Diabetes", command=lambda: self.load_sample_basic_info("diabetes")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Emergency", command=lambda: self.load_sample_basic_info("emergency")).pack(side='left', padx=(5,0))
+        self.add_sample_buttons(sample_frame, partial(self.load_sample_data_for_tab, "basic_info"))
 
     def setup_symptoms_tab(self):
         frame = self.symptoms_frame
@@ -101,57 +617,40 @@ class SymptomCheckerUI:
         # Title
         ttk.Label(frame, text="Symptoms", font=('Arial', 14, 'bold')).pack(pady=10)
 
-        # Create canvas and scrollbar for scrolling
-        canvas = tk.Canvas(frame)
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollable_frame = self.make_scrollable(frame)
 
         # Symptom checkboxes
         self.symptom_vars = {}
-        symptoms_list = [
-            "fever", "fatigue", "cough", "headache", "body_pain", "nausea",
-            "vomiting", "diarrhea", "rash", "sore_throat", "shortness_of_breath",
-            "chest_pain", "confusion", "recent_travel", "medication", "appetite_change",
-            "urine_change", "weight_loss", "night_sweats", "exposure"
-        ]
-
-        for symptom in symptoms_list:
+
+        # Lay out with grid: one row per widget, a single stretchable column
+        scrollable_frame.columnconfigure(0, weight=1)
+
+        for row, (symptom, label) in enumerate(_SYMPTOMS):
             var = tk.BooleanVar()
             self.symptom_vars[symptom] = var
-            ttk.Checkbutton(scrollable_frame, text=symptom.replace('_', ' ').title(),
-                          variable=var).pack(anchor='w', padx=20, pady=2)
+            ttk.Checkbutton(scrollable_frame, text=label,
+                          variable=var).grid(row=row, column=0, sticky='w', padx=20, pady=2)
+        row = len(_SYMPTOMS)
 
         # Additional fields for fever duration and cough type
-        ttk.Label(scrollable_frame, text="Fever Duration (days):").pack(anchor='w', padx=20, pady=(10,0))
+        ttk.Label(scrollable_frame, text="Fever Duration (days):").grid(row=row, column=0, sticky='w', padx=20, pady=(10,0))
         self.fever_duration_var = tk.StringVar()
-        ttk.Entry(scrollable_frame, textvariable=self.fever_duration_var).pack(fill='x', padx=20, pady=(0,10))
+        ttk.Entry(scrollable_frame, textvariable=self.fever_duration_var).grid(row=row + 1, column=0, sticky='ew', padx=20, pady=(0,10))
 
-        ttk.Label(scrollable_frame, text="Cough Type (dry/productive):").pack(anchor='w', padx=20, pady=(10,0))
+        ttk.Label(scrollable_frame, text="Cough Type (dry/productive):").grid(row=row + 2, column=0, sticky='w', padx=20, pady=(10,0))
         self.cough_type_var = tk.StringVar()
-        ttk.Entry(scrollable_frame, textvariable=self.cough_type_var).pack(fill='x', padx=20, pady=(0,10))
+        ttk.Entry(scrollable_frame, textvariable=self.cough_type_var).grid(row=row + 3, column=0, sticky='ew', padx=20, pady=(0,10))
+
+        # Entry fields collected alongside the checkboxes, as (var, parser, key)
+        self.symptom_fields = (
+            (self.fever_duration_var, _parse_int, "fever_duration"),
+            (self.cough_type_var, _parse_cough_type, "cough_type"),
+        )
 
         # Sample data buttons
         sample_frame = ttk.Frame(scrollable_frame)
-        sample_frame.pack(fill='x', padx=20, pady=(10,0))
-        ttk.Label(sample_frame, text="Quick Fill:").pack(side='left')
-        ttk.Button(sample_frame, text="Viral Fever", command=lambda: self.load_sample_symptoms("viral_fever")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Dengue", command=lambda: self.load_sample_symptoms("dengue")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Hep A", command=lambda: self.load_sample_symptoms("hep_a")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="TB", command=lambda: self.load_sample_symptoms("tuberculosis")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="CKD", command=lambda: self.load_sample_symptoms("ckd")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Diabetes", command=lambda: self.load_sample_symptoms("diabetes")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Emergency", command=lambda: self.load_sample_symptoms("emergency")).pack(side='left', padx=(5,0))
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        sample_frame.grid(row=row + 4, column=0, sticky='ew', padx=20, pady=(10,0))
+        self.add_sample_buttons(sample_frame, partial(self.load_sample_data_for_tab, "symptoms"))
 
     def setup_tests_tab(self):
         frame = self.tests_frame
@@ -159,55 +658,92 @@ class SymptomCheckerUI:
         # Title
         ttk.Label(frame, text="Test Results", font=('Arial', 14, 'bold')).pack(pady=10)
 
-        # Create canvas and scrollbar
-        canvas = tk.Canvas(frame)
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollable_frame = self.make_scrollable(frame)
 
         # Test result entries
         self.test_vars = {}
-        tests_list = [
-            "WBC", "Platelets", "Hemoglobin", "Blood_Sugar", "ALT", "Creatinine"
-        ]
 
-        for test in tests_list:
-            ttk.Label(scrollable_frame, text=f"{test}:").pack(anchor='w', padx=20, pady=(5,0))
+        # Lay out with grid: a label row and an entry row per test
+        scrollable_frame.columnconfigure(0, weight=1)
+        row = 0
+
+        for test in _NUMERIC_TESTS:
+            ttk.Label(scrollable_frame, text=f"{test}:").grid(row=row, column=0, sticky='w', padx=20, pady=(5,0))
             var = tk.StringVar()
             self.test_vars[test] = var
-            ttk.Entry(scrollable_frame, textvariable=var).pack(fill='x', padx=20, pady=(0,5))
+            ttk.Entry(scrollable_frame, textvariable=var).grid(row=row + 1, column=0, sticky='ew', padx=20, pady=(0,5))
+            row += 2
 
         # Boolean tests
-        boolean_tests = ["Malaria", "Dengue", "Typhoid"]
         self.boolean_test_vars = {}
 
-        for test in boolean_tests:
-            ttk.Label(scrollable_frame, text=f"{test} (positive/negative):").pack(anchor='w', padx=20, pady=(5,0))
+        for test in _BOOLEAN_TESTS:
+            ttk.Label(scrollable_frame, text=f"{test} (positive/negative):").grid(row=row, column=0, sticky='w', padx=20, pady=(5,0))
             var = tk.StringVar()
             self.boolean_test_vars[test] = var
-            ttk.Entry(scrollable_frame, textvariable=var).pack(fill='x', padx=20, pady=(0,5))
+            ttk.Entry(scrollable_frame, textvariable=var).grid(row=row + 1, column=0, sticky='ew', padx=20, pady=(0,5))
+            row += 2
+
+        # Test entries as (var, parser, key), numeric tests first
+        self.test_fields = (
+            *((var, _parse_float, test) for test, var in self.test_vars.items()),
+            *((var, _parse_result, test) for test, var in self.boolean_test_vars.items()),
+        )
 
         # Sample data buttons
         sample_frame = ttk.Frame(scrollable_frame)
-        sample_frame.pack(fill='x', padx=20, pady=(10,0))
-        ttk.Label(sample_frame, text="Quick Fill:").pack(side='left')
-        ttk.Button(sample_frame, text="Viral Fever", command=lambda: self.load_sample_tests("viral_fever")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Dengue", command=lambda: self.load_sample_tests("dengue")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Hep A", command=lambda: self.load_sample_tests("hep_a")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="TB", command=lambda: self.load_sample_tests("tuberculosis")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="CKD", command=lambda: self.load_sample_tests("ckd")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Diabetes", command=lambda: self.load_sample_tests("diabetes")).pack(side='left', padx=(5,0))
-        ttk.Button(sample_frame, text="Emergency", command=lambda: self.load_sample_tests("emergency")).pack(side='left', padx=(5,0))
+        sample_frame.grid(row=row, column=0, sticky='ew', padx=20, pady=(10,0))
+        self.add_sample_buttons(sample_frame, partial(self.load_sample_data_for_tab, "test_results"))
+
+    def add_sample_buttons(self, parent, loader):
+        """Add the Quick Fill buttons, each calling loader with its sample type."""
+        ttk.Label(parent, text="Quick Fill:").pack(side='left')
+        for text, sample_type in _SAMPLE_BUTTONS:
+            ttk.Button(parent, text=text, command=partial(loader, sample_type)).pack(side='left', padx=(5,0))
+
+    def make_scrollable(self, parent):
+        """Create a vertically scrollable frame inside parent and return it."""
+        canvas = tk.Canvas(parent)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+
+        scrollable_frame.bind("<Configure>", self.on_scrollable_configure)
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        self.scroll_canvases.add(canvas)
 
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
+        return scrollable_frame
+
+    def on_scrollable_configure(self, event):
+        # The scrollable frame's master is the canvas hosting it; bursts of
+        # resize events collapse into one bbox scan per canvas
+        canvas = event.widget.master
+        job = self.scrollregion_jobs.pop(canvas, None)
+        if job is not None:
+            self.root.after_cancel(job)
+        self.scrollregion_jobs[canvas] = self.root.after(
+            _SCROLLREGION_DELAY_MS, self.update_scrollregion, canvas)
+
+    def on_mousewheel(self, event):
+        # Scroll whichever scrollable canvas the pointer is over, if any
+        try:
+            widget = self.root.winfo_containing(event.x_root, event.y_root)
+        except KeyError:
+            # Tk-internal windows (e.g. menus) have no tkinter widget
+            return
+        while widget is not None and widget not in self.scroll_canvases:
+            widget = widget.master
+        if widget is None:
+            return
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        widget.yview_scroll(step, "units")
+
+    def update_scrollregion(self, canvas):
+        self.scrollregion_jobs.pop(canvas, None)
+        canvas.configure(scrollregion=canvas.bbox("all"))
 
     def setup_analysis_tab(self):
         frame = self.analysis_frame
@@ -219,8 +755,16 @@ class SymptomCheckerUI:
         self.loading_label = ttk.Label(frame, text="", font=('Arial', 12))
         self.loading_label.pack(pady=(0,10))
 
+        # Alert banner, packed above the output only while a message is shown
+        self.banner = ttk.Label(frame, font=('Arial', 11, 'bold'), anchor='w', wraplength=700)
+        self.banner_job = None
+
+        # Progress bar, packed above the output only while an analysis runs
+        self.progress_bar = ttk.Progressbar(frame, mode='indeterminate')
+
         # Output text area
-        self.output_text = scrolledtext.ScrolledText(frame, wrap=tk.WORD, height=20)
+        # Read-only; set_output_text and append_streaming_text unlock it for writes
+        self.output_text = scrolledtext.ScrolledText(frame, wrap=WORD, height=20, state='disabled')
         self.output_text.pack(fill='both', expand=True, padx=20, pady=(0,10))
 
         # Buttons
@@ -230,79 +774,23 @@ class SymptomCheckerUI:
         self.analyze_button = ttk.Button(button_frame, text="Analyze", command=self.analyze)
         self.analyze_button.pack(side='left', padx=(0,10))
         ttk.Button(button_frame, text="Clear", command=self.clear_all).pack(side='left', padx=(0,10))
-        ttk.Button(button_frame, text="Exit", command=self.root.quit).pack(side='right')
-
-    def collect_basic_info(self):
-        try:
-            age = int(self.age_var.get()) if self.age_var.get() else None
-        except ValueError:
-            age = None
+        ttk.Button(button_frame, text="Exit", command=self.close).pack(side='right')
 
-        gender = self.gender_var.get().strip().upper() if self.gender_var.get().strip() else None
-        if gender not in ["M", "F"]:
-            gender = None
+    def collect_fields(self, fields):
+        """Parse a table of (var, parser, key) entries into a dict."""
+        return {key: parse(var.get()) for var, parse, key in fields}
 
-        try:
-            weight = float(self.weight_var.get()) if self.weight_var.get() else None
-        except ValueError:
-            weight = None
-
-        try:
-            temperature = float(self.temp_var.get()) if self.temp_var.get() else None
-        except ValueError:
-            temperature = None
-
-        duration = self.duration_var.get().strip() if self.duration_var.get().strip() else None
-        chronic_diseases = self.chronic_var.get()
-
-        self.basic_info = {
-            "age": age,
-            "gender": gender,
-            "weight": weight,
-            "temperature": temperature,
-            "duration": duration,
-            "chronic_diseases": chronic_diseases,
-        }
+    def collect_basic_info(self):
+        self.basic_info = self.collect_fields(self.basic_fields)
+        self.basic_info["chronic_diseases"] = self.chronic_var.get()
 
     def collect_symptoms(self):
-        self.symptoms = {}
-        for symptom, var in self.symptom_vars.items():
-            self.symptoms[symptom] = var.get()
-
+        self.symptoms = {symptom: var.get() for symptom, var in self.symptom_vars.items()}
         # Additional details
-        try:
-            fever_duration = int(self.fever_duration_var.get()) if self.fever_duration_var.get() else None
-            self.symptoms["fever_duration"] = fever_duration
-        except ValueError:
-            self.symptoms["fever_duration"] = None
-
-        cough_type = self.cough_type_var.get().strip().lower() if self.cough_type_var.get().strip() else None
-        if cough_type in ["dry", "productive"]:
-            self.symptoms["cough_type"] = cough_type
-        else:
-            self.symptoms["cough_type"] = None
+        self.symptoms.update(self.collect_fields(self.symptom_fields))
 
     def collect_test_results(self):
-        self.test_results = {}
-
-        # Numeric tests
-        for test, var in self.test_vars.items():
-            value = var.get().strip()
-            if value:
-                try:
-                    self.test_results[test] = float(value)
-                except ValueError:
-                    self.test_results[test] = None
-            else:
-                self.test_results[test] = None
-
-        # Boolean tests
-        for test, var in self.boolean_test_vars.items():
-            value = var.get().strip().lower()
-            if value in ["positive", "negative"]:
-                self.test_results[test] = (value == "positive")
-            else:
-                self.test_results[test] = None
+        self.test_results = self.collect_fields(self.test_fields)
 
     def analyze(self):
         if self.is_loading:
@@ -319,462 +807,172 @@ class SymptomCheckerUI:
             "test_results": self.test_results,
         }
 
-        # Check for emergency
-        emergency, reason = check_emergency(self.symptoms, self.basic_info)
-
-        if emergency:
-            self.output_text.delete(1.0, tk.END)
-            self.output_text.insert(tk.END, f"⚠️ EMERGENCY ALERT: Based on your symptoms, seek immediate medical attention!\n\n Reason: {reason}")
-            self.output_text.insert(tk.END, "Please call emergency services or go to the nearest hospital.\n\n")
-            self.output_text.insert(tk.END, "Analysis skipped due to emergency symptoms.")
-            messagebox.showwarning("Emergency Alert", f"Emergency symptoms detected! Please seek immediate medical attention. \n\n Reason: {reason}")
-            return
-
         # Start loading
         self.start_loading()
 
-        # Run analysis in separate thread
-        analysis_thread = threading.Thread(target=self.perform_analysis, args=(user_data,))
-        analysis_thread.start()
+        # Run analysis on the worker thread
+        self.current_future = self.executor.submit(self.perform_analysis, user_data)
+
+    def close(self):
+        # Drop queued work; an in-flight stream stops at its next chunk
+        self.closing = True
+        if self.current_future is not None:
+            self.current_future.cancel()
+        if sys.version_info >= (3, 9):
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            self.executor.shutdown(wait=False)
+        self.root.destroy()
+
+    def call_in_ui(self, callback, *args, idle=False):
+        # Called from the worker thread; does nothing once the window is closing
+        if self.closing:
+            return
+        try:
+            if idle:
+                self.root.after_idle(callback, *args)
+            else:
+                self.root.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            # The window was destroyed between the check and the call
+            pass
 
     def start_loading(self):
         self.is_loading = True
         self.analyze_button.config(state='disabled')
         self.loading_label.config(text="🔄 Analyzing symptoms... Please wait.")
-        self.output_text.delete(1.0, tk.END)
+        self.hide_banner()
+        self.progress_bar.pack(fill='x', padx=20, pady=(0,10), before=self.output_text.frame)
+        self.progress_bar.start(10)
+        self.set_output_text()
         self.root.update()
 
     def stop_loading(self):
         self.is_loading = False
         self.analyze_button.config(state='normal')
         self.loading_label.config(text="")
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
         self.root.update()
 
     def perform_analysis(self, user_data):
+        # The emergency check runs here so the Tk event loop never waits on it
+        emergency, reasons = check_emergency(user_data["symptoms"], user_data["basic_info"])
+        if emergency:
+            self.call_in_ui(self.show_emergency_alert, ", ".join(reasons))
+            return
+
         try:
-            analysis = ""
-            for chunk in get_symptom_analysis(user_data):
-                analysis += chunk
-                # Update UI incrementally for streaming effect
-                self.root.after(0, lambda: self.update_streaming_text(analysis))
+            parts = []
+            analysis = get_symptom_analysis(user_data)
+            for chunk in analysis:
+                if self.closing:
+                    # Closing the generator closes the HTTP stream it holds
+                    analysis.close()
+                    return
+                parts.append(chunk)
+                # Append only the new text for the streaming effect
+                self.queue_streaming_text(chunk)
             # Final update after streaming completes
-            self.root.after(0, lambda: self.finalize_analysis(analysis))
+            self.call_in_ui(self.finalize_analysis, "".join(parts))
         except Exception as e:
-            self.root.after(0, lambda: self.display_error(str(e)))
+            self.call_in_ui(self.display_error, str(e))
 
-    def update_streaming_text(self, text):
-        # Convert current text to display format
-        html_content = markdown.markdown(text, extensions=['extra', 'codehilite'])
-        plain_text = self.html_to_plain_text(html_content)
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, plain_text)
-        self.output_text.see(tk.END)  # Auto-scroll to bottom
+    def show_emergency_alert(self, reasons):
+        self.stop_loading()
+        self.set_output_text(
+            f"⚠️ EMERGENCY ALERT: Based on your symptoms, seek immediate medical attention!\n\n Reason: {reasons}\n\n",
+            "Please call emergency services or go to the nearest hospital.\n\n",
+            "Analysis skipped due to emergency symptoms.",
+        )
+        self.show_banner(f"⚠️ Emergency symptoms detected! Please seek immediate medical attention. Reason: {reasons}", "emergency")
+        self.root.bell()
+
+    def queue_streaming_text(self, chunk):
+        # Called from the worker thread; at most one flush is queued at a time
+        with self.pending_lock:
+            self.pending_chunks.append(chunk)
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        self.call_in_ui(self.flush_streaming_text, idle=True)
+
+    def flush_streaming_text(self):
+        with self.pending_lock:
+            text = "".join(self.pending_chunks)
+            self.pending_chunks = []
+            self.flush_scheduled = False
+        if text:
+            self.append_streaming_text(text)
+
+    def discard_streaming_text(self):
+        with self.pending_lock:
+            self.pending_chunks = []
+            self.flush_scheduled = False
+
+    def append_streaming_text(self, chunk):
+        # Raw text is shown while streaming; markdown is rendered once at the end
+        self.output_text.config(state='normal')
+        self.output_text.insert(END, chunk)
+        self.output_text.config(state='disabled')
+        self.output_text.see(END)  # Auto-scroll to bottom
+
+    def set_output_text(self, *parts):
+        """Replace the output pane's contents in one unlocked edit."""
+        self.output_text.config(state='normal')
+        self.output_text.delete(1.0, END)
+        for part in parts:
+            self.output_text.insert(END, part)
+        self.output_text.config(state='disabled')
 
     def finalize_analysis(self, analysis):
+        # The full text replaces the streamed preview, so drop unflushed chunks
+        self.discard_streaming_text()
         # Convert final markdown to HTML-like text for display
-        html_content = markdown.markdown(analysis, extensions=['extra', 'codehilite'])
+        html_content = _render_markdown(analysis)
         plain_text = self.html_to_plain_text(html_content)
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, plain_text)
+        self.set_output_text(plain_text)
         self.stop_loading()
 
     def html_to_plain_text(self, html):
         """Convert basic HTML to plain text for ScrolledText"""
-        import re
-
-        # Remove HTML tags but keep structure
-        text = re.sub(r'<h[1-6][^>]*>(.*?)</h[1-6]>', r'\n\1\n' + '='*50 + '\n', html)
-        text = re.sub(r'<h[1-6][^>]*>(.*?)</h[1-6]>', r'\n\1\n' + '-'*30 + '\n', text)
-        text = re.sub(r'<strong[^>]*>(.*?)</strong>', r'\1', text)  # Remove ** markers
-        text = re.sub(r'<em[^>]*>(.*?)</em>', r'\1', text)  # Remove * markers
-        text = re.sub(r'<li[^>]*>(.*?)</li>', r'• \1\n', text)
-        text = re.sub(r'<p[^>]*>(.*?)</p>', r'\1\n\n', text)
-        text = re.sub(r'<br[^>]*>', '\n', text)
-        text = re.sub(r'<[^>]+>', '', text)  # Remove remaining tags
-
-        # Clean up extra whitespace
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        return text.strip()
+        return _html_to_plain_text(html)
 
     def display_analysis(self, analysis):
         self.stop_loading()
-        self.output_text.insert(tk.END, analysis)
+        self.append_streaming_text(analysis)
 
     def display_error(self, error_msg):
         self.stop_loading()
-        messagebox.showerror("Error", f"Failed to get analysis: {error_msg}")
-
-    def load_sample_data(self):
-        """Load sample data from test file."""
-        return {
-            "viral_fever": {
-                "basic_info": {
-                    "age": 25,
-                    "gender": "M",
-                    "weight": 70.0,
-                    "temperature": 38.5,
-                    "duration": "3",
-                    "chronic_diseases": False
-                },
-                "symptoms": {
-                    "fever": True,
-                    "fatigue": True,
-                    "cough": False,
-                    "headache": True,
-                    "body_pain": True,
-                    "nausea": False,
-                    "vomiting": False,
-                    "diarrhea": False,
-                    "rash": False,
-                    "sore_throat": True,
-                    "shortness_of_breath": False,
-                    "chest_pain": False,
-                    "confusion": False,
-                    "recent_travel": False,
-                    "medication": False,
-                    "appetite_change": True,
-                    "urine_change": False,
-                    "weight_loss": False,
-                    "night_sweats": False,
-                    "exposure": False,
-                    "fever_duration": 3,
-                    "cough_type": None
-                },
-                "test_results": {
-                    "WBC": 6500,
-                    "Platelets": 180000,
-                    "Hemoglobin": 14.0,
-                    "Blood_Sugar": 90,
-                    "ALT": 25,
-                    "Creatinine": 0.8,
-                    "Malaria": False,
-                    "Dengue": False,
-                    "Typhoid": False
-                }
-            },
-            "dengue": {
-                "basic_info": {
-                    "age": 30,
-                    "gender": "F",
-                    "weight": 60.0,
-                    "temperature": 39.2,
-                    "duration": "5",
-                    "chronic_diseases": False
-                },
-                "symptoms": {
-                    "fever": True,
-                    "fatigue": True,
-                    "cough": False,
-                    "headache": True,
-                    "body_pain": True,
-                    "nausea": True,
-                    "vomiting": False,
-                    "diarrhea": False,
-                    "rash": True,
-                    "sore_throat": False,
-                    "shortness_of_breath": False,
-                    "chest_pain": False,
-                    "confusion": False,
-                    "recent_travel": True,
-                    "medication": False,
-                    "appetite_change": True,
-                    "urine_change": False,
-                    "weight_loss": False,
-                    "night_sweats": False,
-                    "exposure": False,
-                    "fever_duration": 5,
-                    "cough_type": None
-                },
-                "test_results": {
-                    "WBC": 3000,
-                    "Platelets": 80000,
-                    "Hemoglobin": 12.5,
-                    "Blood_Sugar": 95,
-                    "ALT": 45,
-                    "Creatinine": 0.9,
-                    "Malaria": False,
-                    "Dengue": True,
-                    "Typhoid": False
-                }
-            },
-            "hep_a": {
-                "basic_info": {
-                    "age": 35,
-                    "gender": "M",
-                    "weight": 75.0,
-                    "temperature": 38.0,
-                    "duration": "7",
-                    "chronic_diseases": False
-                },
-                "symptoms": {
-                    "fever": True,
-                    "fatigue": True,
-                    "cough": False,
-                    "headache": False,
-                    "body_pain": False,
-                    "nausea": True,
-                    "vomiting": True,
-                    "diarrhea": True,
-                    "rash": False,
-                    "sore_throat": False,
-                    "shortness_of_breath": False,
-                    "chest_pain": False,
-                    "confusion": False,
-                    "recent_travel": True,
-                    "medication": False,
-                    "appetite_change": True,
-                    "urine_change": True,
-                    "weight_loss": True,
-                    "night_sweats": False,
-                    "exposure": False,
-                    "fever_duration": 7,
-                    "cough_type": None
-                },
-                "test_results": {
-                    "WBC": 5500,
-                    "Platelets": 150000,
-                    "Hemoglobin": 13.5,
-                    "Blood_Sugar": 85,
-                    "ALT": 120,
-                    "Creatinine": 0.9,
-                    "Malaria": False,
-                    "Dengue": False,
-                    "Typhoid": False
-                }
-            },
-            "tuberculosis": {
-                "basic_info": {
-                    "age": 40,
-                    "gender": "F",
-                    "weight": 55.0,
-                    "temperature": 37.8,
-                    "duration": "30",
-                    "chronic_diseases": False
-                },
-                "symptoms": {
-                    "fever": True,
-                    "fatigue": True,
-                    "cough": True,
-                    "headache": False,
-                    "body_pain": False,
-                    "nausea": False,
-                    "vomiting": False,
-                    "diarrhea": False,
-                    "rash": False,
-                    "sore_throat": False,
-                    "shortness_of_breath": True,
-                    "chest_pain": True,
-                    "confusion": False,
-                    "recent_travel": False,
-                    "medication": False,
-                    "appetite_change": True,
-                    "urine_change": False,
-                    "weight_loss": True,
-                    "night_sweats": True,
-                    "exposure": True,
-                    "fever_duration": 30,
-                    "cough_type": "productive"
-                },
-                "test_results": {
-                    "WBC": 8000,
-                    "Platelets": 200000,
-                    "Hemoglobin": 11.0,
-                    "Blood_Sugar": 95,
-                    "ALT": 30,
-                    "Creatinine": 0.8,
-                    "Malaria": False,
-                    "Dengue": False,
-                    "Typhoid": False
-                }
-            },
-            "ckd": {
-                "basic_info": {
-                    "age": 55,
-                    "gender": "M",
-                    "weight": 85.0,
-                    "temperature": 36.8,
-                    "duration": "90",
-                    "chronic_diseases": True
-                },
-                "symptoms": {
-                    "fever": False,
-                    "fatigue": True,
-                    "cough": False,
-                    "headache": False,
-                    "body_pain": False,
-                    "nausea": True,
-                    "vomiting": True,
-                    "diarrhea": False,
-                    "rash": False,
-                    "sore_throat": False,
-                    "shortness_of_breath": True,
-                    "chest_pain": False,
-                    "confusion": False,
-                    "recent_travel": False,
-                    "medication": True,
-                    "appetite_change": True,
-                    "urine_change": True,
-                    "weight_loss": True,
-                    "night_sweats": False,
-                    "exposure": False,
-                    "fever_duration": None,
-                    "cough_type": None
-                },
-                "test_results": {
-                    "WBC": 7000,
-                    "Platelets": 180000,
-                    "Hemoglobin": 9.5,
-                    "Blood_Sugar": 140,
-                    "ALT": 35,
-                    "Creatinine": 3.2,
-                    "Malaria": False,
-                    "Dengue": False,
-                    "Typhoid": False
-                }
-            },
-            "diabetes": {
-                "basic_info": {
-                    "age": 50,
-                    "gender": "F",
-                    "weight": 90.0,
-                    "temperature": 36.5,
-                    "duration": "180",
-                    "chronic_diseases": True
-                },
-                "symptoms": {
-                    "fever": False,
-                    "fatigue": True,
-                    "cough": False,
-                    "headache": False,
-                    "body_pain": False,
-                    "nausea": False,
-                    "vomiting": False,
-                    "diarrhea": False,
-                    "rash": False,
-                    "sore_throat": False,
-                    "shortness_of_breath": False,
-                    "chest_pain": False,
-                    "confusion": False,
-                    "recent_travel": False,
-                    "medication": True,
-                    "appetite_change": True,
-                    "urine_change": True,
-                    "weight_loss": True,
-                    "night_sweats": False,
-                    "exposure": False,
-                    "fever_duration": None,
-                    "cough_type": None
-                },
-                "test_results": {
-                    "WBC": 6500,
-                    "Platelets": 200000,
-                    "Hemoglobin": 12.0,
-                    "Blood_Sugar": 280,
-                    "ALT": 40,
-                    "Creatinine": 1.1,
-                    "Malaria": False,
-                    "Dengue": False,
-                    "Typhoid": False
-                }
-            },
-            "emergency": {
-                "basic_info": {
-                    "age": 45,
-                    "gender": "M",
-                    "weight": 80.0,
-                    "temperature": 40.5,
-                    "duration": "2",
-                    "chronic_diseases": True
-                },
-                "symptoms": {
-                    "fever": True,
-                    "fatigue": True,
-                    "cough": False,
-                    "headache": True,
-                    "body_pain": True,
-                    "nausea": False,
-                    "vomiting": False,
-                    "diarrhea": False,
-                    "rash": False,
-                    "sore_throat": False,
-                    "shortness_of_breath": True,
-                    "chest_pain": True,
-                    "confusion": True,
-                    "recent_travel": False,
-                    "medication": True,
-                    "appetite_change": False,
-                    "urine_change": False,
-                    "weight_loss": False,
-                    "night_sweats": False,
-                    "exposure": False,
-                    "fever_duration": 2,
-                    "cough_type": None
-                },
-                "test_results": {}
-            }
-        }
-
-    def load_sample_basic_info(self, sample_type):
-        """Load sample basic info data."""
-        data = self.sample_data[sample_type]["basic_info"]
-        self.age_var.set(str(data["age"]) if data["age"] else "")
-        self.gender_var.set(data["gender"] if data["gender"] else "")
-        self.weight_var.set(str(data["weight"]) if data["weight"] else "")
-        self.temp_var.set(str(data["temperature"]) if data["temperature"] else "")
-        self.duration_var.set(data["duration"] if data["duration"] else "")
-        self.chronic_var.set(data["chronic_diseases"])
-
-    def load_sample_symptoms(self, sample_type):
-        """Load sample symptoms data."""
-        data = self.sample_data[sample_type]["symptoms"]
-        for symptom, var in self.symptom_vars.items():
-            var.set(data.get(symptom, False))
-
-        self.fever_duration_var.set(str(data.get("fever_duration", "")) if data.get("fever_duration") else "")
-        self.cough_type_var.set(data.get("cough_type", "") if data.get("cough_type") else "")
-
-    def load_sample_tests(self, sample_type):
-        """Load sample test results data."""
-        data = self.sample_data[sample_type]["test_results"]
-
-        # Numeric tests
-        for test, var in self.test_vars.items():
-            value = data.get(test)
-            var.set(str(value) if value is not None else "")
-
-        # Boolean tests
-        for test, var in self.boolean_test_vars.items():
-            value = data.get(test)
-            if value is True:
-                var.set("positive")
-            elif value is False:
-                var.set("negative")
-            else:
-                var.set("")
+        self.show_banner(f"Failed to get analysis: {error_msg}", "error")
+
+    def show_banner(self, message, severity):
+        """Show a non-modal alert above the output; call on the Tk thread."""
+        colour, timeout_ms = _BANNER_STYLES[severity]
+        self.hide_banner()
+        self.banner.config(text=message, foreground=colour)
+        self.banner.pack(fill='x', padx=20, pady=(0,10), before=self.output_text.frame)
+        if timeout_ms is not None:
+            self.banner_job = self.root.after(timeout_ms, self.hide_banner)
+
+    def hide_banner(self):
+        if self.banner_job is not None:
+            self.root.after_cancel(self.banner_job)
+            self.banner_job = None
+        self.banner.pack_forget()
+
+    def load_sample_data_for_tab(self, data_type, sample_type):
+        """Load one section of a sample case into its tab."""
+        data = self.sample_data[sample_type][data_type]
+        for var, formatter, key in self.sample_fields[data_type]:
+            var.set(formatter(data.get(key)))
 
     def clear_all(self):
-        # Clear basic info
-        self.age_var.set("")
-        self.gender_var.set("")
-        self.weight_var.set("")
-        self.temp_var.set("")
-        self.duration_var.set("")
-        self.chronic_var.set(False)
-
-        # Clear symptoms
-        for var in self.symptom_vars.values():
-            var.set(False)
-        self.fever_duration_var.set("")
-        self.cough_type_var.set("")
-
-        # Clear tests
-        for var in self.test_vars.values():
-            var.set("")
-        for var in self.boolean_test_vars.values():
-            var.set("")
+        self.root.tk.eval(self.clear_script)
 
         # Clear output
-        self.output_text.delete(1.0, tk.END)
+        self.hide_banner()
+        self.set_output_text()
 
 if __name__ == "__main__":
     root = tk.Tk()
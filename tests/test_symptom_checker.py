@@ -1,17 +1,36 @@
+import dbm
+import io
 import os
 import json
+import shelve
+import sys
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
-try:
-    from dotenv import load_dotenv
-    from openai import OpenAI
-    load_dotenv()
-except ImportError as e:
-    print(f"Error: Required dependencies not installed. {e}")
-    print("Please install required dependencies: pip install python-dotenv openai")
-    exit(1)
+import pytest
+from hypothesis import given, strategies as st
 
 # Import functions from symptom_checker.py
-from src.healthcase.symptom_checker import get_symptom_analysis, check_emergency
+from src.healthcase import symptom_checker
+from src.healthcase.symptom_checker import (
+    get_symptom_analysis,
+    check_emergency,
+    get_mock_analysis,
+    get_symptoms,
+    get_symptoms_batch,
+    analyze_batch,
+    _get_api_key,
+)
+
+
+@pytest.fixture(scope="session")
+def api_key():
+    """Load .env once per session and skip live tests when no key is set."""
+    try:
+        return _get_api_key()
+    except (ImportError, ValueError) as e:
+        pytest.skip(str(e))
 
 def simulate_user_input(sample_data):
     """Simulate user input with sample data."""
@@ -173,6 +192,316 @@ sample_emergency = {
     "test_results": {}
 }
 
+sample_malaria = {
+    "symptoms": {"fever": True, "recent_travel": True},
+    "test_results": {"Malaria": True}
+}
+
+sample_typhoid = {
+    "symptoms": {"fever": True, "nausea": True, "diarrhea": True},
+    "test_results": {"Typhoid": True}
+}
+
+
+@pytest.mark.parametrize("user_data,disease,confidence", [
+    (sample_viral_fever, "Viral Fever", 60),
+    (sample_dengue, "Dengue", 75),
+    (sample_malaria, "Malaria", 70),
+    (sample_typhoid, "Typhoid", 65),
+    ({}, "Common Cold", 40),
+], ids=["viral_fever", "dengue", "malaria", "typhoid", "default"])
+def test_get_mock_analysis(user_data, disease, confidence):
+    """The most confident matching rule is listed first."""
+    analysis = get_mock_analysis(user_data)
+    assert f"1. {disease} – {confidence}%" in analysis
+
+
+def make_chunk(text):
+    """Build a minimal stand-in for one streamed completion chunk."""
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class StubStream:
+    """Iterable chunk stream that, like openai's Stream, closes on exiting a with block."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.closed = False
+
+    def __iter__(self):
+        return self.chunks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+        return False
+
+
+def test_get_symptoms_batch_matches_interactive(monkeypatch):
+    """One comma-separated line gives the same symptoms as the y/n questions."""
+    answers = ["y", "n", "y"] + ["n"] * (len(symptom_checker._SYMPTOM_QUESTIONS) - 3)
+    follow_ups = "5\ndry\n"
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(answers) + "\n" + follow_ups))
+    interactive = get_symptoms()
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(", ".join(answers) + "\n" + follow_ups))
+    batch = get_symptoms_batch(symptom_checker._ask(symptom_checker._SYMPTOM_BATCH_PROMPT))
+
+    assert batch == interactive
+    assert batch["fever_duration"] == 5
+    assert batch["cough_type"] == "dry"
+
+
+def test_get_symptoms_batch_is_lenient(monkeypatch):
+    """Unknown answers mean no, missing ones default to no, extras are ignored."""
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n"))
+    symptom_keys = [symptom for symptom, _ in symptom_checker._SYMPTOM_QUESTIONS]
+
+    short = get_symptoms_batch("Y, maybe")
+    assert short["fever"] is True
+    assert not any(short[symptom] for symptom in symptom_keys[1:])
+
+    long = get_symptoms_batch(" ".join(["y"] * (len(symptom_keys) + 5)))
+    assert all(long[symptom] for symptom in symptom_keys)
+    assert set(long) == set(symptom_keys) | {"fever_duration", "cough_type"}
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Start from an empty analysis cache that never touches the disk."""
+    monkeypatch.setattr(symptom_checker, "_cache_path", lambda: None)
+    monkeypatch.setattr(symptom_checker, "_analysis_cache", OrderedDict())
+
+
+@pytest.fixture
+def disk_cache(memory_cache, monkeypatch, tmp_path):
+    """Point the disk tier at a fresh shelf under tmp_path and return its path."""
+    path = str(tmp_path / "analysis_cache")
+    monkeypatch.setattr(symptom_checker, "_cache_path", lambda: path)
+    return path
+
+
+@pytest.fixture
+def stub_client(memory_cache, monkeypatch):
+    """Route get_symptom_analysis to a stub client with an empty, memory-only cache."""
+    client = MagicMock()
+    monkeypatch.setattr(symptom_checker, "_get_api_key", lambda: "test-key")
+    monkeypatch.setattr(symptom_checker, "_get_client", lambda api_key: client)
+    return client
+
+
+def test_get_symptom_analysis_streams_and_caches(stub_client):
+    """Small deltas are coalesced and a repeated request is served from the cache."""
+    stub_client.chat.completions.create.return_value = StubStream(
+        [make_chunk("Test "), make_chunk(None), make_chunk("response")]
+    )
+
+    assert list(get_symptom_analysis(sample_viral_fever)) == ["Test response"]
+    assert "".join(get_symptom_analysis(sample_viral_fever)) == "Test response"
+    stub_client.chat.completions.create.assert_called_once()
+
+
+def test_get_symptom_analysis_does_not_cache_empty_stream(stub_client):
+    """A stream with no content is retried rather than replayed as blank."""
+    stub_client.chat.completions.create.side_effect = lambda **kwargs: StubStream(
+        [make_chunk(None), make_chunk(None)]
+    )
+
+    assert list(get_symptom_analysis(sample_viral_fever)) == []
+    assert list(get_symptom_analysis(sample_viral_fever)) == []
+    assert stub_client.chat.completions.create.call_count == 2
+
+
+def test_get_symptom_analysis_closes_stream_when_abandoned(stub_client):
+    """Closing the generator mid-stream also closes the HTTP response."""
+    stream = StubStream([make_chunk("x" * symptom_checker.STREAM_FLUSH_CHARS)] * 3)
+    stub_client.chat.completions.create.return_value = stream
+
+    analysis = get_symptom_analysis(sample_viral_fever)
+    next(analysis)
+    assert not stream.closed
+    analysis.close()
+
+    assert stream.closed
+
+
+def test_cache_path_is_read_after_dotenv(monkeypatch):
+    """A cache path set only in .env is honoured, with ~ expanded."""
+    monkeypatch.delenv(symptom_checker.CACHE_PATH_ENV, raising=False)
+    monkeypatch.setattr(
+        symptom_checker,
+        "_load_env",
+        lambda: monkeypatch.setenv(symptom_checker.CACHE_PATH_ENV, "~/cache/analyses"),
+    )
+
+    assert symptom_checker._cache_path() == os.path.expanduser("~/cache/analyses")
+
+
+def test_disk_cache_round_trip(disk_cache):
+    """An analysis stored on disk is served after the memory cache is lost."""
+    analysis = "Viral Fever – 60%\n" * 10
+    symptom_checker._store_analysis("key", analysis)
+    symptom_checker._analysis_cache.clear()
+
+    assert "".join(symptom_checker._get_cached_analysis("key")) == analysis
+
+
+def test_disk_cache_expires_after_ttl(disk_cache, monkeypatch):
+    symptom_checker._save_to_disk("key", ("stale",))
+    monkeypatch.setattr(symptom_checker, "CACHE_TTL_SECONDS", -1)
+
+    assert symptom_checker._get_cached_analysis("key") is None
+    with shelve.open(disk_cache) as db:
+        assert "key" not in db
+
+
+def test_disk_cache_evicts_oldest_to_low_water(disk_cache, monkeypatch):
+    monkeypatch.setattr(symptom_checker, "CACHE_DISK_MAX_ENTRIES", 4)
+    monkeypatch.setattr(symptom_checker, "CACHE_DISK_LOW_WATER", 2)
+    with shelve.open(disk_cache) as db:
+        for i in range(4):
+            db[f"old{i}"] = (float(i), ("x",))
+
+    symptom_checker._save_to_disk("new", ("y",))
+
+    with shelve.open(disk_cache) as db:
+        assert sorted(db) == ["new", "old3"]
+
+
+def test_disk_cache_drops_corrupt_entry(disk_cache):
+    """A damaged entry is a cache miss rather than an error, and is removed."""
+    symptom_checker._save_to_disk("key", ("ok",))
+    with dbm.open(disk_cache, "w") as db:
+        db[b"key"] = b"garbage"
+
+    assert symptom_checker._get_cached_analysis("key") is None
+    with shelve.open(disk_cache) as db:
+        assert "key" not in db
+
+
+class StubAsyncClient:
+    """Stand-in for AsyncOpenAI that echoes the user message back."""
+
+    requests = 0
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def create(self, model, messages):
+        StubAsyncClient.requests += 1
+        content = messages[-1]["content"]
+        if "fail" in content:
+            raise RuntimeError("rate limited")
+        if "empty" in content:
+            message = SimpleNamespace(content=None)
+        else:
+            message = SimpleNamespace(content=f"Analysis of {content}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_analyze_batch_keeps_order_and_per_user_errors(memory_cache, monkeypatch):
+    """Results follow the input order and a failed user does not sink the batch."""
+    monkeypatch.setattr("openai.AsyncOpenAI", StubAsyncClient)
+    monkeypatch.setattr(StubAsyncClient, "requests", 0)
+    monkeypatch.setattr(symptom_checker, "_get_api_key", lambda: "test-key")
+    users = [
+        {"basic_info": {"age": 25}},
+        {"basic_info": {"name": "fail"}},
+        {"basic_info": {"age": 30}},
+    ]
+
+    first, failed, last = analyze_batch(users)
+
+    assert '"age":25' in first
+    assert isinstance(failed, Exception)
+    assert "rate limited" in str(failed)
+    assert '"age":30' in last
+    # Successful analyses are cached, so a repeat makes no request
+    assert analyze_batch(users[:1]) == [first]
+    assert StubAsyncClient.requests == 3
+
+
+def test_analyze_batch_reports_empty_analysis(memory_cache, monkeypatch):
+    """An empty completion is that user's error and is asked for again next time."""
+    monkeypatch.setattr("openai.AsyncOpenAI", StubAsyncClient)
+    monkeypatch.setattr(StubAsyncClient, "requests", 0)
+    monkeypatch.setattr(symptom_checker, "_get_api_key", lambda: "test-key")
+    users = [{"basic_info": {"name": "empty"}}]
+
+    (result,) = analyze_batch(users)
+
+    assert isinstance(result, Exception)
+    assert "empty analysis" in str(result)
+    analyze_batch(users)
+    assert StubAsyncClient.requests == 2
+
+
+@pytest.mark.parametrize("sample_data,expected", [
+    (sample_viral_fever, False),
+    (sample_dengue, False),
+    (sample_emergency, True),
+], ids=["viral_fever", "dengue", "emergency"])
+def test_check_emergency_samples(sample_data, expected):
+    emergency, reasons = check_emergency(sample_data["symptoms"], sample_data["basic_info"])
+    assert emergency is expected
+    assert bool(reasons) is expected
+
+
+# Symptoms the emergency rules look at, and some they ignore
+emergency_symptoms = ("fever", "confusion", "shortness_of_breath", "chest_pain")
+other_symptoms = ("fatigue", "cough", "headache", "body_pain", "nausea", "rash")
+
+
+@given(
+    temperature=st.none() | st.floats(min_value=35, max_value=45),
+    symptoms=st.fixed_dictionaries({s: st.booleans() for s in emergency_symptoms}),
+    others=st.fixed_dictionaries({s: st.booleans() for s in other_symptoms}),
+    added=st.sampled_from(emergency_symptoms),
+)
+def test_check_emergency_properties(temperature, symptoms, others, added):
+    basic_info = {"temperature": temperature}
+    emergency, reasons = check_emergency(symptoms, basic_info)
+
+    # The alert is raised exactly when some rule gives a reason
+    assert emergency == bool(reasons)
+    # Every reason comes from a distinct rule
+    rule_reasons = [reason for _, reason in symptom_checker._EMERGENCY_RULES]
+    assert len(set(reasons)) == len(reasons)
+    assert set(reasons) <= set(rule_reasons)
+    # Symptoms outside the rules never change the outcome
+    assert check_emergency({**others, **symptoms}, basic_info) == (emergency, reasons)
+    # Reporting one more symptom never withdraws a reason
+    _, more_reasons = check_emergency({**symptoms, added: True}, basic_info)
+    assert set(reasons) <= set(more_reasons)
+
+
+@pytest.mark.parametrize("temperature,expected", [
+    (40.0, False),
+    (40.1, True),
+])
+def test_check_emergency_temperature_boundary(temperature, expected):
+    """Only a temperature strictly above 40°C is an emergency on its own."""
+    emergency, _ = check_emergency({}, {"temperature": temperature})
+    assert emergency is expected
+
+
+@pytest.mark.integration
+def test_live_symptom_analysis(api_key, memory_cache):
+    """Stream a real analysis for the viral fever sample from OpenRouter."""
+    # Only the first chunk is needed to show the stream works
+    first_chunk = next(get_symptom_analysis(sample_viral_fever), None)
+    assert first_chunk
+
+
 if __name__ == "__main__":
     print("Testing Symptom Checker with Sample Data\n")
 
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("markdown")
+
+from symptom_checker_ui import _html_to_plain_text, _render_markdown
+
+
+def render(text):
+    return _html_to_plain_text(_render_markdown(text))
+
+
+@pytest.mark.parametrize("text", [
+    "- Rest\n- Fluids\n",
+    "- Rest\n\n- Fluids\n",
+], ids=["tight", "loose"])
+def test_list_items_keep_text_on_bullet_line(text):
+    lines = render(text).splitlines()
+    assert "• Rest" in lines
+    assert "• Fluids" in lines
+
+
+def test_entities_are_decoded():
+    assert render("Fever & chills &amp; rest") == "Fever & chills & rest"
+
+
+def test_preformatted_text_keeps_indentation():
+    text = render("```\nfever:  yes\n    days: 3\n```\n")
+    assert "fever:  yes\n    days: 3" in text
+
+
+def test_headings_are_underlined():
+    assert render("## Next Steps\nSee a doctor.") == (
+        "Next Steps\n" + "=" * 50 + "\n\nSee a doctor."
+    )